@@ -1,10 +1,83 @@
+import gc
 import json
-from pathlib import Path
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from renderer.render import Renderer
 from replay_parser import ReplayParser
 from renderer.utils import LOGGER
 
 
+def write_player_builds(renderer: Renderer, builds_path: str):
+    # Compact output: consumers parse this file, nobody reads it by hand.
+    builds = json.dumps(renderer.get_player_build(), separators=(",", ":"))
+    with open(builds_path, "w") as f:
+        f.write(builds)
+
+
+def render_replay(
+    replay_path: str,
+    anon: bool = False,
+    no_chat: bool = False,
+    no_logs: bool = False,
+    team_tracers: bool = False,
+    fps: int = 20,
+    quality: int = 7,
+    use_tqdm: bool = True,
+) -> str:
+    """Renders a replay to an mp4 next to it, along with its player builds.
+
+    Args:
+        replay_path (str): The .wowsreplay file to render.
+        anon (bool): Anonymize player names.
+        no_chat (bool): Disable chat.
+        no_logs (bool): Disable logs (ribbons, damage, etc).
+        team_tracers (bool): Enable team tracers.
+        fps (int): Output FPS.
+        quality (int): Output quality (0-10).
+        use_tqdm (bool): Show a progress bar while rendering.
+
+    Returns:
+        str: The path of the rendered video.
+    """
+    base_path = os.path.splitext(replay_path)[0]
+    video_path = f"{base_path}.mp4"
+    builds_path = f"{base_path}-builds.json"
+    with (
+        open(replay_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        # The parser reads the file once, front to back.
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        LOGGER.info("Parsing the replay file...")
+        replay_info = ReplayParser(
+            mm, strict=True, raw_data_output=False
+        ).get_info()
+        LOGGER.info(f"Replay has version {replay_info['open']['clientVersionFromExe']}")
+        LOGGER.info("Rendering the replay file...")
+        renderer = Renderer(
+            replay_info["hidden"]["replay_data"],
+            logs=not no_logs,
+            enable_chat=not no_chat,
+            anon=anon,
+            team_tracers=team_tracers,
+            use_tqdm=use_tqdm,
+        )
+        # The builds export is independent of the video, so overlap it with encoding.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            builds_job = executor.submit(write_player_builds, renderer, builds_path)
+            # The render loop churns through short-lived objects without
+            # creating cycles worth collecting; skip the GC passes until done.
+            gc.disable()
+            try:
+                renderer.start(video_path, fps=fps, quality=quality)
+            finally:
+                gc.enable()
+            builds_job.result()
+    return video_path
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -18,25 +91,14 @@ if __name__ == "__main__":
     parser.add_argument("--quality", type=int, default=7, help="Output quality (0-10)")
 
     namespace = parser.parse_args()
-    path = Path(namespace.replay)
-    video_path = path.parent.joinpath(f"{path.stem}.mp4")
-    with open(namespace.replay, "rb") as f:
-        LOGGER.info("Parsing the replay file...")
-        replay_info = ReplayParser(
-            f, strict=True, raw_data_output=False
-        ).get_info()
-        LOGGER.info(f"Replay has version {replay_info['open']['clientVersionFromExe']}")
-        LOGGER.info("Rendering the replay file...")
-        renderer = Renderer(
-            replay_info["hidden"]["replay_data"],
-            logs=not namespace.no_logs,
-            enable_chat=not namespace.no_chat,
-            anon=namespace.anon,
-            team_tracers=namespace.team_tracers,
-            use_tqdm=True,
-        )
-        with open(path.parent.joinpath(f"{path.stem}-builds.json"), "w") as fp:
-            json.dump(renderer.get_player_build(), fp, indent=4)
-        renderer.start(str(video_path), fps=namespace.fps, quality=namespace.quality)
-        LOGGER.info(f"The video file is at: {str(video_path)}")
-        LOGGER.info("Done.")
+    video_path = render_replay(
+        namespace.replay,
+        anon=namespace.anon,
+        no_chat=namespace.no_chat,
+        no_logs=namespace.no_logs,
+        team_tracers=namespace.team_tracers,
+        fps=namespace.fps,
+        quality=namespace.quality,
+    )
+    LOGGER.info(f"The video file is at: {video_path}")
+    LOGGER.info("Done.")
@@ -10,6 +10,7 @@ from renderer.resman import ResourceManager
 from renderer.conman import ConsumableManager
 from renderer.exceptions import MapLoadError
 from renderer.shipbuilder import ShipBuilder
+from renderer.writer import BufferedFrameWriter
 from PIL import Image, ImageDraw
 from imageio_ffmpeg import write_frames
 from tqdm import tqdm
@@ -41,7 +42,7 @@ class RendererBase:
             if self.logs:
                 m_block = 17
 
-        return write_frames(
+        writer = write_frames(
             path=path,
             fps=fps,
             quality=quality,
@@ -57,6 +58,8 @@ class RendererBase:
                 "animation",
             ],
         )
+        width, height = self.minimap_bg.size
+        return BufferedFrameWriter(writer, frame_size=width * height * 4)
 
     def _load_map(self):
         """Loads the map.
@@ -261,6 +264,9 @@ class RenderDual(RendererBase):
         total = len(prog)
         last_per = 0.0
 
+        minimap_img = self.minimap_fg.copy()
+        minimap_bg = self.minimap_bg.copy()
+
         for idx, i in enumerate(prog):
             if progress_cb:
                 per = round((idx + 1) / total, 1)
@@ -270,8 +276,8 @@ class RenderDual(RendererBase):
 
             self.conman.update(i)
 
-            minimap_img = self.minimap_fg.copy()
-            minimap_bg = self.minimap_bg.copy()
+            minimap_img.paste(self.minimap_fg)
+            minimap_bg.paste(self.minimap_bg)
             draw = ImageDraw.Draw(minimap_img)
 
             g_capture.draw(i, minimap_img)
@@ -412,6 +418,11 @@ class Renderer(RendererBase):
         total = len(prog)
         last_per = 0.0
 
+        # Allocate the frame images once and reset them by pasting the base
+        # images over them each tick instead of copying.
+        minimap_img = self.minimap_fg.copy()
+        minimap_bg = self.minimap_bg.copy()
+
         for idx, game_time in enumerate(prog):
             if progress_cb:
                 per = round((idx + 1) / total, 1)
@@ -419,8 +430,8 @@ class Renderer(RendererBase):
                     last_per = per
                     progress_cb(per)
 
-            minimap_img = self.minimap_fg.copy()
-            minimap_bg = self.minimap_bg.copy()
+            minimap_img.paste(self.minimap_fg)
+            minimap_bg.paste(self.minimap_bg)
 
             draw = ImageDraw.Draw(minimap_img)
             self.conman.update(game_time)
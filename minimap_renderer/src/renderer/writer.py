@@ -0,0 +1,71 @@
+import queue
+import threading
+
+from typing import Generator, Optional
+
+
+_STOP = object()
+
+
+class BufferedFrameWriter:
+    """Feeds frames to an imageio-ffmpeg writer from a background thread.
+
+    Frames are queued up to a byte budget, so a slow encoder or a disk stall
+    on ffmpeg's side doesn't hold up drawing the next frames. It exposes the
+    same ``send``/``close`` interface as the wrapped generator.
+    """
+
+    def __init__(
+        self,
+        writer: Generator,
+        frame_size: int,
+        buffer_bytes: int = 64 * 1024 * 1024,
+    ):
+        """Initializes this class.
+
+        Args:
+            writer (Generator): A primed-on-first-send imageio-ffmpeg writer.
+            frame_size (int): Size of a single frame in bytes.
+            buffer_bytes (int, optional): Upper bound of queued frame data.
+            Defaults to 64 MiB.
+        """
+        self._writer = writer
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max(1, buffer_bytes // frame_size)
+        )
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._error: Optional[BaseException] = None
+
+    def _drain(self):
+        while (frame := self._queue.get()) is not _STOP:
+            if self._error:
+                continue
+            try:
+                self._writer.send(frame)
+            except BaseException as e:
+                self._error = e
+
+    def send(self, frame: Optional[bytes]):
+        """Queues a frame. ``None`` starts the writer, like the generator.
+
+        Raises:
+            BaseException: The error raised by the writer thread, if any.
+        """
+        if frame is None:
+            self._writer.send(None)
+            self._thread.start()
+            return
+
+        if self._error:
+            raise self._error
+        self._queue.put(frame)
+
+    def close(self):
+        """Flushes queued frames and closes the underlying writer."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._writer.close()
+
+        if self._error:
+            raise self._error
@@ -1,66 +1,128 @@
 import os
+import json
+import hashlib
 import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.responses import HTMLResponse, FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 import database
+from config import CONFIG
+from storage import safe_unlink
+from http_cache import VideoFileResponse, file_cache_headers, not_modified
 from datetime import datetime, timedelta
+from urllib.parse import quote
 
 # Configuration
-CLEANUP_HOURS = int(os.getenv("CLEANUP_HOURS", 24))
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
+STATIC_DIR = Path(__file__).parent / "static"
+UNLINK_CONCURRENCY = 32
+CLEANUP_INTERVAL = 3600
+CLEANUP_MIN_INTERVAL = 60
+BOOTSTRAP_INFO_LIMIT = 10
+JOBS_WATCH_INTERVAL = 1.0
+JOBS_STREAM_KEEPALIVE = 15
 
 # Ensure directories exist (though main app should have created them)
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
+# Plain-string forms for building per-job file paths without Path objects
+UPLOAD_DIR_STR = os.fspath(UPLOAD_DIR)
+OUTPUT_DIR_STR = os.fspath(OUTPUT_DIR)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _job_paths(job) -> List[str]:
+    """Files on disk belonging to a job: the uploaded replay, player info, render log and video."""
+    paths = [
+        os.path.join(UPLOAD_DIR_STR, f"{job['id']}_{job['filename']}"),
+        os.path.join(OUTPUT_DIR_STR, f"{job['id']}.json"),
+        os.path.join(OUTPUT_DIR_STR, f"{job['id']}.log"),
+    ]
+    if job['output_path']:
+        paths.append(job['output_path'])
+    return paths
+
+def _unlink_batch(paths: List[str]):
+    for path in paths:
+        safe_unlink(path)
+
+def _unlink_job_files(jobs):
+    # A job's files are removed together and in order by the same worker
+    for job in jobs:
+        _unlink_batch(_job_paths(job))
+
+async def _run_batched(func, items: list):
+    # Split the items into at most UNLINK_CONCURRENCY batches, one thread hop
+    # each, instead of paying an executor round-trip per item
+    if not items:
+        return
+    step = -(-len(items) // UNLINK_CONCURRENCY)
+    await asyncio.gather(*(
+        asyncio.to_thread(func, items[i:i + step])
+        for i in range(0, len(items), step)
+    ))
+
+async def _unlink_all(paths: List[str]):
+    await _run_batched(_unlink_batch, paths)
+
+def _list_files(*directories: Path) -> List[str]:
+    """Regular files directly inside the given directories, from a single scandir pass each."""
+    # DirEntry.is_file() answers from the directory listing on Linux, and the
+    # raw entry paths go straight to os.unlink without building Path objects
+    files = []
+    for directory in directories:
+        with os.scandir(directory) as it:
+            files.extend(entry.path for entry in it if entry.is_file(follow_symlinks=False))
+    return files
+
+# Cleanup's SQLite work runs on its own thread so it never competes with API handlers for the default pool
+cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleanup")
+
+async def _run_cleanup(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(cleanup_executor, func, *args)
+
 async def cleanup_task():
     while True:
         try:
-            logger.info(f"Running cleanup task. Deleting jobs older than {CLEANUP_HOURS} hours.")
+            logger.info(f"Running cleanup task. Deleting jobs older than {CONFIG.cleanup_hours} hours.")
             
-            # Get jobs to clean up
-            old_jobs = database.get_old_completed_jobs(CLEANUP_HOURS)
+            # Rows are removed in one statement; their files are unlinked afterwards
+            old_jobs = await _run_cleanup(database.reap_old_completed_jobs, CONFIG.cleanup_hours)
             
             for job in old_jobs:
-                job_id = job['id']
-                logger.info(f"Cleaning up job {job_id}")
+                logger.info(f"Cleaning up job {job['id']}")
                 
-                # Delete files
-                input_path = UPLOAD_DIR / f"{job_id}_{job['filename']}"
-                if input_path.exists():
-                    input_path.unlink()
-                
-                if job['output_path']:
-                    output_path = Path(job['output_path'])
-                    if output_path.exists():
-                        output_path.unlink()
-                        
-                info_path = OUTPUT_DIR / f"{job_id}.json"
-                if info_path.exists():
-                    info_path.unlink()
-                    
-                database.delete_job(job_id)
+            await _run_batched(_unlink_job_files, old_jobs)
                 
+            # Sleep until the next completed job expires rather than a fixed hour. The floor
+            # batches a burst of expiries into one sweep instead of waking once per job.
+            remaining = await _run_cleanup(database.get_seconds_until_next_expiry, CONFIG.cleanup_hours)
+            if remaining is None:
+                delay = CLEANUP_INTERVAL
+            else:
+                delay = min(max(remaining, CLEANUP_MIN_INTERVAL), CLEANUP_INTERVAL)
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
+            delay = CLEANUP_INTERVAL
             
-        await asyncio.sleep(3600)
+        await asyncio.sleep(delay)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    database.init_db()
     task = asyncio.create_task(cleanup_task())
+    watch_task = asyncio.create_task(jobs_watch_task())
     yield
     task.cancel()
+    watch_task.cancel()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -72,79 +134,170 @@ class JobModel(BaseModel):
     created_at: str
     completed_at: Optional[str]
 
-@app.get("/admin/jobs", response_model=List[JobModel])
-async def get_all_jobs():
-    jobs = database.get_all_jobs()
-    return jobs
+def _read_info(job_id: str):
+    try:
+        return json.loads((OUTPUT_DIR / f"{job_id}.json").read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _polled_json_response(request: Request, content: bytes) -> Response:
+    """JSON response tagged with a hash of its body, so unchanged polls come back as 304."""
+    headers = {
+        "ETag": f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+        "Cache-Control": "no-cache",
+    }
+    return not_modified(request, headers) or Response(content=content, media_type="application/json", headers=headers)
+
+# JobModel only documents the response shape; rows are returned without validation
+@app.get("/admin/jobs", responses={200: {"model": List[JobModel]}})
+async def get_all_jobs(request: Request):
+    # SQLite builds the JobModel-shaped JSON itself, so no per-row Python objects are created
+    content = await asyncio.to_thread(database.get_all_jobs_summary_json)
+    return _polled_json_response(request, content.encode("utf-8"))
+
+async def _bootstrap_payload() -> dict:
+    jobs = await asyncio.to_thread(database.get_all_jobs_summary)
+    recent = [job for job in jobs if job['status'] == 'completed'][:BOOTSTRAP_INFO_LIMIT]
+    infos = await asyncio.gather(*(asyncio.to_thread(_read_info, job['id']) for job in recent))
+    for job, info in zip(recent, infos):
+        if info is not None:
+            job['info'] = info
+    return {"jobs": jobs}
+
+@app.get("/admin/bootstrap")
+async def get_bootstrap(request: Request):
+    """Job list for the admin UI, with player info inlined for the most recent completed jobs."""
+    return _polled_json_response(request, json.dumps(await _bootstrap_payload()).encode("utf-8"))
+
+# Latest bootstrap payload as JSON, shared by every /admin/jobs/stream subscriber.
+# It is only kept up to date while someone is subscribed.
+_jobs_snapshot: Optional[str] = None
+_jobs_subscribers = 0
+_jobs_changed = asyncio.Condition()
+
+async def jobs_watch_task():
+    """Rebuild the job snapshot whenever the database changes and wake stream subscribers."""
+    global _jobs_snapshot
+    last_version = None
+    while True:
+        try:
+            if not _jobs_subscribers:
+                _jobs_snapshot = last_version = None
+            else:
+                # data_version also moves on commits from the main app's process,
+                # so this catches render progress without an update hook
+                version = await asyncio.to_thread(database.get_data_version)
+                if version != last_version:
+                    last_version = version
+                    snapshot = json.dumps(await _bootstrap_payload())
+                    if snapshot != _jobs_snapshot:
+                        async with _jobs_changed:
+                            _jobs_snapshot = snapshot
+                            _jobs_changed.notify_all()
+        except Exception as e:
+            logger.error(f"Error watching jobs: {e}")
+            last_version = None
+        await asyncio.sleep(JOBS_WATCH_INTERVAL)
+
+@app.get("/admin/jobs/stream")
+async def stream_jobs():
+    """Server-sent events carrying the bootstrap payload each time the job list changes."""
+    async def events():
+        global _jobs_subscribers
+        _jobs_subscribers += 1
+        sent = None
+        try:
+            while True:
+                message = ": keepalive\n\n"
+                async with _jobs_changed:
+                    try:
+                        await asyncio.wait_for(
+                            _jobs_changed.wait_for(lambda: _jobs_snapshot is not None and _jobs_snapshot is not sent),
+                            JOBS_STREAM_KEEPALIVE,
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    else:
+                        sent = _jobs_snapshot
+                        message = f"data: {sent}\n\n"
+                # Never yield while holding the lock, or the watcher can't publish
+                yield message
+        finally:
+            _jobs_subscribers -= 1
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.delete("/admin/jobs/{job_id}")
 async def delete_job(job_id: str):
-    job = database.get_job(job_id)
+    job = await asyncio.to_thread(database.get_job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
         
-    # Delete files
-    input_path = UPLOAD_DIR / f"{job_id}_{job['filename']}"
-    if input_path.exists():
-        input_path.unlink()
-    
-    if job['output_path']:
-        output_path = Path(job['output_path'])
-        if output_path.exists():
-            output_path.unlink()
-            
-    info_path = OUTPUT_DIR / f"{job_id}.json"
-    if info_path.exists():
-        info_path.unlink()
-        
-    database.delete_job(job_id)
+    await asyncio.to_thread(_unlink_job_files, [job])
+    await asyncio.to_thread(database.delete_job, job_id)
     return {"message": "Job deleted"}
 
 @app.delete("/admin/jobs")
 async def delete_all_jobs():
     # Delete all files
-    for file in UPLOAD_DIR.glob("*"):
-        if file.is_file():
-            file.unlink()
+    files = await asyncio.to_thread(_list_files, UPLOAD_DIR, OUTPUT_DIR)
+    await _unlink_all(files)
             
-    for file in OUTPUT_DIR.glob("*"):
-        if file.is_file():
-            file.unlink()
-            
-    database.delete_all_jobs()
+    await asyncio.to_thread(database.delete_all_jobs)
     return {"message": "All jobs deleted"}
 
 @app.get("/admin/jobs/{job_id}/video")
-async def get_admin_video(job_id: str):
-    job = database.get_job(job_id)
-    if not job:
+async def get_admin_video(job_id: str, request: Request):
+    # A <video> element issues many Range requests per view; this lookup is cached
+    output_path = await asyncio.to_thread(database.get_job_output_path, job_id)
+    if output_path:
+        # Stat once and hand the result to FileResponse so it doesn't stat again
+        try:
+            stat_result = os.stat(output_path)
+        except FileNotFoundError:
+            pass
+        else:
+            headers = file_cache_headers(stat_result)
+            unchanged = not_modified(request, headers)
+            if unchanged:
+                return unchanged
+            if CONFIG.video_accel_redirect:
+                # Let the fronting nginx send the file with sendfile() and handle Range itself
+                headers["X-Accel-Redirect"] = CONFIG.video_accel_redirect + quote(os.path.basename(output_path))
+                return Response(media_type="video/mp4", headers=headers)
+            return VideoFileResponse(
+                path=output_path, media_type="video/mp4", stat_result=stat_result, headers=headers
+            )
+    elif not await asyncio.to_thread(database.get_job, job_id):
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job['output_path']:
-        output_path = Path(job['output_path'])
-        if output_path.exists():
-            return FileResponse(path=output_path, media_type="video/mp4")
-    
     raise HTTPException(status_code=404, detail="Video file not found")
 
 @app.get("/admin/jobs/{job_id}/info")
-async def get_admin_info(job_id: str):
+async def get_admin_info(job_id: str, request: Request):
     info_path = OUTPUT_DIR / f"{job_id}.json"
-    if info_path.exists():
-        return FileResponse(path=info_path, media_type="application/json")
-    raise HTTPException(status_code=404, detail="Player info not found")
-
-@app.get("/", response_class=HTMLResponse)
-async def admin_ui():
-    html_content = """
+    try:
+        stat_result = os.stat(info_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Player info not found")
+    headers = file_cache_headers(stat_result)
+    return not_modified(request, headers) or FileResponse(
+        path=info_path, media_type="application/json", stat_result=stat_result, headers=headers
+    )
+
+# Placeholders of the form {{name}} are filled in by render_admin_html()
+ADMIN_HTML_TEMPLATE = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Minimap Renderer Admin</title>
-        <script src="https://cdn.tailwindcss.com"></script>
-        <script src="https://unpkg.com/lucide@latest"></script>
+        <link rel="stylesheet" href="/static/admin.css?v={{admin_css_version}}">
     </head>
     <body class="bg-slate-900 text-slate-200 p-8">
         <div class="max-w-7xl mx-auto">
@@ -152,10 +305,10 @@ async def admin_ui():
                 <h1 class="text-3xl font-bold text-white">Minimap Renderer Admin</h1>
                 <div class="flex items-center gap-4">
                     <div class="text-sm text-slate-400">
-                        Cleanup Period: <span class="font-mono text-white bg-slate-800 px-2 py-1 rounded">""" + str(CLEANUP_HOURS) + """ hours</span>
+                        Cleanup Period: <span class="font-mono text-white bg-slate-800 px-2 py-1 rounded">{{cleanup_hours}} hours</span>
                     </div>
                     <button onclick="confirmDeleteAll()" class="bg-red-500/10 hover:bg-red-500/20 text-red-400 border border-red-500/20 px-4 py-2 rounded-lg text-sm font-medium transition-colors flex items-center gap-2">
-                        <i data-lucide="trash-2" class="w-4 h-4"></i>
+                        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="w-4 h-4"><path d="M3 6h18"/><path d="M19 6v14c0 1-1 2-2 2H7c-1 0-2-1-2-2V6"/><path d="M8 6V4c0-1 1-2 2-2h4c1 0 2 1 2 2v2"/><line x1="10" x2="10" y1="11" y2="17"/><line x1="14" x2="14" y1="11" y2="17"/></svg>
                         Delete All
                     </button>
                 </div>
@@ -177,6 +330,26 @@ async def admin_ui():
                         <!-- Jobs will be populated here -->
                     </tbody>
                 </table>
+                <template id="job-row-template">
+                    <tr class="hover:bg-slate-700/50 transition-colors">
+                        <td data-field="status"></td>
+                        <td data-field="id" class="px-6 py-4 font-mono text-xs text-slate-500"></td>
+                        <td data-field="filename" class="px-6 py-4 text-white"></td>
+                        <td data-field="created_at" class="px-6 py-4 text-slate-400"></td>
+                        <td data-field="completed_at" class="px-6 py-4 text-slate-400"></td>
+                        <td class="px-6 py-4 text-right">
+                            <button data-action="watch" class="text-blue-400 hover:text-blue-300 hover:bg-blue-400/10 px-3 py-1.5 rounded-lg transition-colors text-xs font-medium border border-blue-400/20 mr-2">
+                                Watch
+                            </button>
+                            <button data-action="info" class="text-indigo-400 hover:text-indigo-300 hover:bg-indigo-400/10 px-3 py-1.5 rounded-lg transition-colors text-xs font-medium border border-indigo-400/20 mr-2">
+                                Info
+                            </button>
+                            <button data-action="delete" class="text-red-400 hover:text-red-300 hover:bg-red-400/10 px-3 py-1.5 rounded-lg transition-colors text-xs font-medium border border-red-400/20">
+                                Delete
+                            </button>
+                        </td>
+                    </tr>
+                </template>
             </div>
         </div>
 
@@ -186,7 +359,7 @@ async def admin_ui():
                 <div class="flex items-center justify-between p-4 border-b border-white/5 bg-white/5">
                     <h3 class="text-lg font-medium text-white">Video Preview</h3>
                     <button onclick="closeVideoModal()" class="p-2 rounded-full hover:bg-white/10 text-slate-400 hover:text-white transition-colors">
-                        <i data-lucide="x" class="w-5 h-5"></i>
+                        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="w-5 h-5"><path d="M18 6 6 18"/><path d="m6 6 12 12"/></svg>
                     </button>
                 </div>
                 <div class="aspect-video bg-black">
@@ -200,11 +373,11 @@ async def admin_ui():
             <div class="relative w-full max-w-4xl bg-slate-900 rounded-2xl overflow-hidden shadow-2xl border border-white/10 max-h-[90vh] flex flex-col">
                 <div class="flex items-center justify-between p-6 border-b border-white/10 bg-slate-900/50 backdrop-blur-md sticky top-0 z-10">
                     <h3 class="text-xl font-semibold text-white flex items-center gap-2">
-                        <i data-lucide="users" class="w-5 h-5 text-blue-400"></i>
+                        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="w-5 h-5 text-blue-400"><path d="M16 21v-2a4 4 0 0 0-4-4H6a4 4 0 0 0-4 4v2"/><circle cx="9" cy="7" r="4"/><path d="M22 21v-2a4 4 0 0 0-3-3.87"/><path d="M16 3.13a4 4 0 0 1 0 7.75"/></svg>
                         Player Information
                     </h3>
                     <button onclick="closeInfoModal()" class="p-2 text-slate-400 hover:text-white hover:bg-white/10 rounded-full transition-colors">
-                        <i data-lucide="x" class="w-5 h-5"></i>
+                        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="w-5 h-5"><path d="M18 6 6 18"/><path d="m6 6 12 12"/></svg>
                     </button>
                 </div>
                 <div id="info-content" class="overflow-y-auto p-6 space-y-8">
@@ -214,11 +387,11 @@ async def admin_ui():
         </div>
 
         <!-- Confirmation Modal -->
-        <div id="confirm-modal" class="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/80 backdrop-blur-sm hidden animate-in fade-in duration-200">
-            <div class="relative w-full max-w-md bg-slate-900 rounded-2xl overflow-hidden shadow-2xl border border-white/10 p-6 animate-in zoom-in-95 duration-200">
+        <div id="confirm-modal" class="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/80 backdrop-blur-sm hidden duration-200">
+            <div class="relative w-full max-w-md bg-slate-900 rounded-2xl overflow-hidden shadow-2xl border border-white/10 p-6 duration-200">
                 <div class="flex flex-col items-center text-center">
                     <div class="w-12 h-12 rounded-full bg-red-500/10 flex items-center justify-center mb-4">
-                        <i data-lucide="alert-triangle" class="w-6 h-6 text-red-400"></i>
+                        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="w-6 h-6 text-red-400"><path d="m21.73 18-8-14a2 2 0 0 0-3.48 0l-8 14A2 2 0 0 0 4 21h16a2 2 0 0 0 1.73-3"/><path d="M12 9v4"/><path d="M12 17h.01"/></svg>
                     </div>
                     <h3 class="text-xl font-semibold text-white mb-2">Are you sure?</h3>
                     <p id="confirm-message" class="text-slate-400 mb-6">This action cannot be undone.</p>
@@ -235,55 +408,77 @@ async def admin_ui():
         </div>
 
         <script>
-            lucide.createIcons();
             let pendingDeleteId = null;
             let isDeleteAll = false;
+            // Player info inlined by /admin/bootstrap, keyed by job id
+            let jobInfos = new Map();
+            // Rendered table rows keyed by job id, so polls only touch rows that changed
+            const jobRows = new Map();
+            let jobsEtag = null;
+
+            // Rows are cloned from #job-row-template and filled in with textContent,
+            // so a changed row never goes through the HTML parser
+            const jobRowTemplate = document.getElementById('job-row-template').content.firstElementChild;
+            const statusColors = { completed: 'text-emerald-400', failed: 'text-red-400', processing: 'text-blue-400' };
+
+            function createJobRow(job) {
+                const tr = jobRowTemplate.cloneNode(true);
+                tr.querySelector('[data-field="id"]').textContent = `${job.id.substring(0, 8)}...`;
+                tr.querySelector('[data-field="filename"]').textContent = job.filename;
+                tr.querySelector('[data-field="created_at"]').textContent = new Date(job.created_at).toLocaleString();
+                tr.querySelector('[data-action="watch"]').onclick = () => openVideo(job.id);
+                tr.querySelector('[data-action="info"]').onclick = () => openInfo(job.id);
+                tr.querySelector('[data-action="delete"]').onclick = () => confirmDeleteJob(job.id);
+                return tr;
+            }
+
+            function updateJobRow(tr, job) {
+                const status = tr.querySelector('[data-field="status"]');
+                status.textContent = job.status;
+                status.className = `px-6 py-4 font-medium ${statusColors[job.status] || 'text-slate-400'} capitalize`;
+                tr.querySelector('[data-field="completed_at"]').textContent = job.completed_at ? new Date(job.completed_at).toLocaleString() : '-';
+                const completed = job.status === 'completed';
+                tr.querySelector('[data-action="watch"]').hidden = !completed;
+                tr.querySelector('[data-action="info"]').hidden = !completed;
+            }
 
             async function fetchJobs() {
-                const response = await fetch('/admin/jobs');
-                const jobs = await response.json();
+                // Revalidate ourselves so an unchanged job list comes back as an empty 304
+                const headers = jobsEtag ? { 'If-None-Match': jobsEtag } : {};
+                const response = await fetch('/admin/bootstrap', { headers, cache: 'no-store' });
+                if (response.status === 304) return;
+                jobsEtag = response.headers.get('ETag');
+                const { jobs } = await response.json();
+                applyJobs(jobs);
+            }
+
+            function applyJobs(jobs) {
+                jobInfos = new Map(jobs.filter(job => job.info).map(job => [job.id, job.info]));
                 const tbody = document.getElementById('jobs-table');
-                tbody.innerHTML = '';
 
-                jobs.forEach(job => {
-                    const tr = document.createElement('tr');
-                    tr.className = 'hover:bg-slate-700/50 transition-colors';
-                    
-                    let statusColor = 'text-slate-400';
-                    if (job.status === 'completed') statusColor = 'text-emerald-400';
-                    if (job.status === 'failed') statusColor = 'text-red-400';
-                    if (job.status === 'processing') statusColor = 'text-blue-400';
-
-                    let actions = '';
-                    if (job.status === 'completed') {
-                        actions += `
-                            <button onclick="openVideo('${job.id}')" class="text-blue-400 hover:text-blue-300 hover:bg-blue-400/10 px-3 py-1.5 rounded-lg transition-colors text-xs font-medium border border-blue-400/20 mr-2">
-                                Watch
-                            </button>
-                            <button onclick="openInfo('${job.id}')" class="text-indigo-400 hover:text-indigo-300 hover:bg-indigo-400/10 px-3 py-1.5 rounded-lg transition-colors text-xs font-medium border border-indigo-400/20 mr-2">
-                                Info
-                            </button>
-                        `;
+                const ids = new Set(jobs.map(job => job.id));
+                for (const [id, row] of jobRows) {
+                    if (!ids.has(id)) {
+                        row.tr.remove();
+                        jobRows.delete(id);
                     }
-                    actions += `
-                        <button onclick="confirmDeleteJob('${job.id}')" class="text-red-400 hover:text-red-300 hover:bg-red-400/10 px-3 py-1.5 rounded-lg transition-colors text-xs font-medium border border-red-400/20">
-                            Delete
-                        </button>
-                    `;
-
-                    tr.innerHTML = `
-                        <td class="px-6 py-4 font-medium ${statusColor} capitalize">${job.status}</td>
-                        <td class="px-6 py-4 font-mono text-xs text-slate-500">${job.id.substring(0, 8)}...</td>
-                        <td class="px-6 py-4 text-white">${job.filename}</td>
-                        <td class="px-6 py-4 text-slate-400">${new Date(job.created_at).toLocaleString()}</td>
-                        <td class="px-6 py-4 text-slate-400">${job.completed_at ? new Date(job.completed_at).toLocaleString() : '-'}</td>
-                        <td class="px-6 py-4 text-right">
-                            ${actions}
-                        </td>
-                    `;
-                    tbody.appendChild(tr);
+                }
+
+                jobs.forEach((job, index) => {
+                    let row = jobRows.get(job.id);
+                    if (!row) {
+                        row = { tr: createJobRow(job), key: null };
+                        jobRows.set(job.id, row);
+                    }
+                    // Only status and completion time change once a job exists
+                    const key = `${job.status}|${job.completed_at}`;
+                    if (row.key !== key) {
+                        updateJobRow(row.tr, job);
+                        row.key = key;
+                    }
+                    const current = tbody.children[index];
+                    if (current !== row.tr) tbody.insertBefore(row.tr, current || null);
                 });
-                lucide.createIcons();
             }
 
             function confirmDeleteJob(id) {
@@ -338,9 +533,12 @@ async def admin_ui():
 
             async function openInfo(id) {
                 try {
-                    const response = await fetch(`/admin/jobs/${id}/info`);
-                    if (!response.ok) throw new Error('Info not found');
-                    const players = await response.json();
+                    let players = jobInfos.get(id);
+                    if (!players) {
+                        const response = await fetch(`/admin/jobs/${id}/info`);
+                        if (!response.ok) throw new Error('Info not found');
+                        players = await response.json();
+                    }
                     
                     const modal = document.getElementById('info-modal');
                     const content = document.getElementById('info-content');
@@ -404,15 +602,55 @@ async def admin_ui():
                 document.getElementById('info-modal').classList.add('hidden');
             }
 
-            // Initial fetch and poll every 5 seconds
+            // Initial fetch, then let the server push the job list whenever it changes
             fetchJobs();
-            setInterval(fetchJobs, 5000);
+            const jobStream = new EventSource('/admin/jobs/stream');
+            jobStream.onmessage = (event) => applyJobs(JSON.parse(event.data).jobs);
         </script>
     </body>
     </html>
     """
-    return html_content
+
+def render_admin_html(**context) -> bytes:
+    html = ADMIN_HTML_TEMPLATE
+    for name, value in context.items():
+        html = html.replace("{{" + name + "}}", str(value))
+    return html.encode("utf-8")
+
+class ImmutableStaticFiles(StaticFiles):
+    # Asset URLs carry a content hash, so browsers can keep them forever
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+app.mount("/static", ImmutableStaticFiles(directory=STATIC_DIR), name="static")
+
+# The admin page only depends on startup configuration, so render it once at import
+ADMIN_HTML = render_admin_html(
+    cleanup_hours=CONFIG.cleanup_hours,
+    admin_css_version=hashlib.blake2b((STATIC_DIR / "admin.css").read_bytes(), digest_size=8).hexdigest(),
+)
+ADMIN_HTML_HEADERS = {
+    "ETag": f'"{hashlib.blake2b(ADMIN_HTML, digest_size=16).hexdigest()}"',
+    "Cache-Control": "public, max-age=60",
+}
+
+@app.get("/", response_class=HTMLResponse)
+async def admin_ui(request: Request):
+    return not_modified(request, ADMIN_HTML_HEADERS) or HTMLResponse(content=ADMIN_HTML, headers=ADMIN_HTML_HEADERS)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # Single worker: the cleanup task and SQLite connections live in this process.
+    # Scale out with more replicas behind the proxy rather than forked workers.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        workers=1,
+    )
@@ -0,0 +1,37 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings read from the environment once at startup."""
+    cleanup_hours: int
+    # Render workers per backend process; None means an equal share of the CPUs
+    max_workers: Optional[int]
+    # Backend server processes sharing the machine (uvicorn's own WEB_CONCURRENCY)
+    web_concurrency: int
+    # Uploads are refused while this many jobs are waiting to render (0 = no limit)
+    queue_max: int
+    # Largest request body the backend accepts, in MiB (nginx in front allows 100M)
+    max_upload_mb: int
+    # Seconds a single render may run before its process is killed
+    render_timeout: float
+    # URI prefix an nginx "internal" location maps onto the outputs directory.
+    # When set, both apps hand video bodies to nginx via X-Accel-Redirect.
+    video_accel_redirect: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        return cls(
+            cleanup_hours=int(os.getenv("CLEANUP_HOURS", 24)),
+            max_workers=int(os.getenv("MAX_WORKERS") or 0) or None,
+            web_concurrency=int(os.getenv("WEB_CONCURRENCY") or 1),
+            queue_max=int(os.getenv("QUEUE_MAX") or 128),
+            max_upload_mb=int(os.getenv("MAX_UPLOAD_MB") or 100),
+            render_timeout=float(os.getenv("RENDER_TIMEOUT", 3600)),
+            video_accel_redirect=os.getenv("VIDEO_ACCEL_REDIRECT") or None,
+        )
+
+
+CONFIG = Config.from_env()
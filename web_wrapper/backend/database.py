@@ -1,16 +1,76 @@
 import sqlite3
 import json
 import os
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from contextlib import contextmanager
 
 DB_PATH = Path(os.getenv("DB_PATH", "jobs.db"))
 
+# Short-lived cache in front of get_job() to absorb repeated lookups from polling clients.
+# Only finished jobs are cached: another process may move a queued or processing job on
+# at any moment, and that write wouldn't invalidate this process's copy.
+JOB_CACHE_TTL = 2.0
+FINISHED_STATUSES = ("completed", "failed")
+JOB_CACHE_SIZE = 1024
+_job_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_job_cache_lock = threading.Lock()
+# Rendered output paths never change once set, so they stay cached until the job is
+# invalidated. Jobs without an output yet are never cached, so they can't go stale.
+_output_path_cache: "OrderedDict[str, str]" = OrderedDict()
+
+def _copy_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    # Cached jobs are never handed out directly, so a caller that modifies its
+    # job (or the job's config) can't change what the next caller gets
+    job = dict(job)
+    if isinstance(job.get('config'), dict):
+        job['config'] = dict(job['config'])
+    return job
+
+def _cache_get(job_id: str) -> Optional[Dict[str, Any]]:
+    with _job_cache_lock:
+        entry = _job_cache.get(job_id)
+        if entry is None:
+            return None
+        expires, job = entry
+        if expires < time.monotonic():
+            del _job_cache[job_id]
+            return None
+        _job_cache.move_to_end(job_id)
+        return _copy_job(job)
+
+def _cache_put(job: Dict[str, Any]):
+    with _job_cache_lock:
+        _job_cache[job['id']] = (time.monotonic() + JOB_CACHE_TTL, _copy_job(job))
+        _job_cache.move_to_end(job['id'])
+        while len(_job_cache) > JOB_CACHE_SIZE:
+            _job_cache.popitem(last=False)
+
+def _cache_invalidate(*job_ids: str):
+    with _job_cache_lock:
+        for job_id in job_ids:
+            _job_cache.pop(job_id, None)
+            _output_path_cache.pop(job_id, None)
+
+def _cache_clear():
+    with _job_cache_lock:
+        _job_cache.clear()
+        _output_path_cache.clear()
+
 def init_db():
     """Initialize the database with the jobs table."""
-    with sqlite3.connect(DB_PATH, timeout=30.0) as conn:
+    with get_db() as conn:
+        # WAL lets readers (e.g. the admin UI polling) proceed while a writer commits.
+        # The mode is persistent, so every later connection picks it up.
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Let bulk deletes hand freed pages back to the filesystem (see _reclaim_free_pages).
+        # Switching an existing database over only takes effect after a one-off VACUUM.
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
         conn.execute("""
             CREATE TABLE IF NOT EXISTS jobs (
                 id TEXT PRIMARY KEY,
@@ -18,99 +78,316 @@ def init_db():
                 status TEXT NOT NULL,
                 message TEXT,
                 session_id TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP,
+                created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                completed_at INTEGER,
                 config TEXT,
-                output_path TEXT
+                output_path TEXT,
+                render_key TEXT,
+                claimed_by TEXT,
+                heartbeat_at INTEGER
             )
         """)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (("render_key", "TEXT"), ("claimed_by", "TEXT"), ("heartbeat_at", "INTEGER")):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        # Timestamps used to be stored as local-time text; convert them to epoch seconds
+        for column in ("created_at", "completed_at"):
+            conn.execute(
+                f"UPDATE jobs SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER) "
+                f"WHERE typeof({column}) = 'text'"
+            )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_cleanup ON jobs(status, completed_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_session_created ON jobs(session_id, created_at DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_render_key ON jobs(render_key, completed_at) "
+            "WHERE render_key IS NOT NULL"
+        )
         conn.commit()
 
-def dict_factory(cursor, row):
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
+# One connection per thread, opened lazily and kept for the life of the thread
+_local = threading.local()
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, timeout=30.0)
+    # C-level row mapping; callers that need a mutable dict convert explicitly
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    # Sorts without a covering index (e.g. ORDER BY created_at) build temp b-trees
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(DB_PATH, timeout=30.0)
-    conn.row_factory = dict_factory
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
     try:
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        # The connection is reused, so never leave a half-done transaction open on it
+        conn.rollback()
+        raise
+
+# Dedicated connection for change detection. PRAGMA data_version only moves when
+# *another* connection commits, so this one must never be used for writes.
+_watch_conn: Optional[sqlite3.Connection] = None
+_watch_lock = threading.Lock()
 
-def create_job(job_id: str, filename: str, session_id: str, config: Dict[str, Any], status: str = "queued"):
+def get_data_version() -> int:
+    """A number that changes whenever any connection, in any process, commits to the database."""
+    global _watch_conn
+    with _watch_lock:
+        if _watch_conn is None:
+            _watch_conn = sqlite3.connect(DB_PATH, timeout=30.0, check_same_thread=False)
+        return _watch_conn.execute("PRAGMA data_version").fetchone()[0]
+
+def create_job(job_id: str, filename: str, session_id: str, config: Dict[str, Any], status: str = "queued",
+               render_key: Optional[str] = None):
     with get_db() as conn:
         conn.execute(
-            "INSERT INTO jobs (id, filename, status, session_id, config, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-            (job_id, filename, status, session_id, json.dumps(config), datetime.now())
+            "INSERT INTO jobs (id, filename, status, session_id, config, created_at, render_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, filename, status, session_id, json.dumps(config), int(time.time()), render_key)
         )
         conn.commit()
+    _cache_invalidate(job_id)
+
+# Timestamps are stored as integer epoch seconds and only turned into
+# ISO-8601 UTC strings on the way out, either in SQL or via format_timestamp()
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def format_timestamp(timestamp: Optional[int]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return time.strftime(ISO_FORMAT, time.gmtime(timestamp))
+
+def _iso_sql(column: str) -> str:
+    return f"strftime('{ISO_FORMAT}', {column}, 'unixepoch')"
+
+def _job_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    if job['config']:
+        job['config'] = json.loads(job['config'])
+    return job
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    job = _cache_get(job_id)
+    if job is not None:
+        return job
     with get_db() as conn:
         cursor = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-        job = cursor.fetchone()
-        if job and job['config']:
-            job['config'] = json.loads(job['config'])
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        job = _job_from_row(row)
+        if job['status'] in FINISHED_STATUSES:
+            _cache_put(job)
         return job
 
-def update_job_status(job_id: str, status: str, message: str = "", output_path: str = None):
-    with get_db() as conn:
-        updates = ["status = ?", "message = ?"]
-        params = [status, message]
-        
-        if status == "completed":
-            updates.append("completed_at = ?")
-            params.append(datetime.now())
-            
-        if output_path:
-            updates.append("output_path = ?")
-            params.append(output_path)
-            
-        params.append(job_id)
-        
-        conn.execute(f"UPDATE jobs SET {', '.join(updates)} WHERE id = ?", params)
+# One fixed statement per (sets completed_at, sets output_path, checks claimant) shape, so
+# every update reuses a cached prepared statement instead of assembling SQL per call
+_UPDATE_STATUS_SQL = {
+    (has_completed, has_output, has_claimant): "UPDATE jobs SET status = ?, message = ?"
+    + (", completed_at = ?" if has_completed else "")
+    + (", output_path = ?" if has_output else "")
+    + " WHERE id = ?"
+    + (" AND claimed_by = ?" if has_claimant else "")
+    for has_completed in (False, True)
+    for has_output in (False, True)
+    for has_claimant in (False, True)
+}
+
+def get_job_output_path(job_id: str) -> Optional[str]:
+    """The job's rendered video path, or None if it doesn't exist or has no output yet."""
+    with _job_cache_lock:
+        output_path = _output_path_cache.get(job_id)
+        if output_path is not None:
+            _output_path_cache.move_to_end(job_id)
+            return output_path
+    with get_db() as conn:
+        row = conn.execute("SELECT output_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    output_path = row['output_path'] if row else None
+    if output_path:
+        with _job_cache_lock:
+            _output_path_cache[job_id] = output_path
+            while len(_output_path_cache) > JOB_CACHE_SIZE:
+                _output_path_cache.popitem(last=False)
+    return output_path
+
+def update_job_status(job_id: str, status: str, message: str = "", output_path: str = None,
+                      claimed_by: Optional[str] = None) -> bool:
+    """Set a job's status. Returns False if nothing was updated.
+
+    With claimed_by, the job is only updated while it is still claimed by that
+    process, so a worker whose job was requeued and claimed elsewhere can't
+    overwrite the new claimant's result.
+    """
+    params = [status, message]
+    has_completed = status == "completed"
+    if has_completed:
+        params.append(int(time.time()))
+    if output_path:
+        params.append(output_path)
+    params.append(job_id)
+    if claimed_by:
+        params.append(claimed_by)
+
+    with get_db() as conn:
+        cursor = conn.execute(_UPDATE_STATUS_SQL[has_completed, bool(output_path), bool(claimed_by)], params)
         conn.commit()
+    _cache_invalidate(job_id)
+    return cursor.rowcount > 0
 
-def get_jobs_by_session(session_id: str) -> List[Dict[str, Any]]:
+def get_session_jobs_summary(session_id: str) -> List[Dict[str, Any]]:
+    """A session's jobs, newest first, with only the columns the job list shows."""
     with get_db() as conn:
-        cursor = conn.execute("SELECT * FROM jobs WHERE session_id = ? ORDER BY created_at DESC", (session_id,))
-        jobs = cursor.fetchall()
-        for job in jobs:
-            if job['config']:
-                job['config'] = json.loads(job['config'])
-        return jobs
+        cursor = conn.execute(
+            f"SELECT id, filename, status, message, {_iso_sql('completed_at')} AS completed_at "
+            "FROM jobs WHERE session_id = ? ORDER BY created_at DESC, rowid DESC",
+            (session_id,)
+        )
+        return [dict(row) for row in cursor]
 
-def get_all_jobs() -> List[Dict[str, Any]]:
+def get_session_outputs(session_id: str) -> List[Dict[str, Any]]:
+    """Filename and output_path of a session's completed jobs, newest first."""
     with get_db() as conn:
-        cursor = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC")
-        jobs = cursor.fetchall()
-        for job in jobs:
-            if job['config']:
-                job['config'] = json.loads(job['config'])
-        return jobs
+        cursor = conn.execute(
+            "SELECT filename, output_path FROM jobs WHERE session_id = ? AND status = 'completed' "
+            "ORDER BY created_at DESC, rowid DESC",
+            (session_id,)
+        )
+        return [dict(row) for row in cursor]
+
+def get_all_jobs_summary() -> List[Dict[str, Any]]:
+    """All jobs, newest first, with only the columns the admin job list shows."""
+    with get_db() as conn:
+        cursor = conn.execute(
+            f"SELECT id, filename, status, message, {_iso_sql('created_at')} AS created_at, "
+            f"{_iso_sql('completed_at')} AS completed_at "
+            "FROM jobs ORDER BY created_at DESC, rowid DESC"
+        )
+        return [dict(row) for row in cursor]
+
+def get_all_jobs_summary_json() -> str:
+    """Same rows as get_all_jobs_summary(), serialized to a JSON array by SQLite itself."""
+    with get_db() as conn:
+        row = conn.execute(
+            "SELECT json_group_array(json_object("
+            "'id', id, 'filename', filename, 'status', status, 'message', message, "
+            f"'created_at', {_iso_sql('created_at')}, 'completed_at', {_iso_sql('completed_at')})) "
+            "FROM (SELECT * FROM jobs ORDER BY created_at DESC, rowid DESC)"
+        ).fetchone()
+        return row[0]
 
 def delete_job(job_id: str):
     with get_db() as conn:
         conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
         conn.commit()
+    _cache_invalidate(job_id)
+
+def _reclaim_free_pages(conn: sqlite3.Connection):
+    # executescript() steps the pragma to completion; execute() would free a single page
+    conn.executescript("PRAGMA incremental_vacuum;")
 
-def get_old_completed_jobs(hours: int) -> List[Dict[str, Any]]:
+def reap_old_completed_jobs(hours: int) -> List[sqlite3.Row]:
+    """Delete every completed job that finished more than `hours` ago and return their file info."""
     with get_db() as conn:
-        # SQLite datetime function usage depends on how we stored it. 
-        # We stored as python datetime object which sqlite adapter converts to string usually.
-        # Let's use python to filter to be safe and DB agnostic for now, or use sqlite modifier.
-        # 'completed_at' is stored as a string like '2023-10-27 10:00:00.123456'
-        
         cursor = conn.execute(
-            f"SELECT * FROM jobs WHERE status = 'completed' AND completed_at < datetime('now', '-{hours} hours')"
+            "DELETE FROM jobs WHERE status = 'completed' AND completed_at < ? "
+            "RETURNING id, filename, output_path",
+            (int(time.time()) - hours * 3600,)
+        )
+        jobs = cursor.fetchall()
+        conn.commit()
+        if jobs:
+            _reclaim_free_pages(conn)
+    _cache_invalidate(*(job['id'] for job in jobs))
+    return jobs
+
+def find_rendered_job(render_key: str) -> Optional[Dict[str, Any]]:
+    """The newest completed job with this render key (id and output_path), or None."""
+    with get_db() as conn:
+        row = conn.execute(
+            "SELECT id, output_path FROM jobs "
+            "WHERE render_key = ? AND status = 'completed' AND output_path IS NOT NULL "
+            "ORDER BY completed_at DESC LIMIT 1",
+            (render_key,)
+        ).fetchone()
+    return dict(row) if row else None
+
+def claim_next_job(claimed_by: str) -> Optional[Dict[str, Any]]:
+    """Mark the oldest queued job as processing by claimed_by and return it, or None if nothing is queued.
+
+    The claim is a single UPDATE under the write lock, so workers in any number of
+    processes sharing the database never pick up the same job twice.
+    """
+    with get_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            "UPDATE jobs SET status = 'processing', message = '', claimed_by = ?, heartbeat_at = ? WHERE id = "
+            "(SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at, rowid LIMIT 1) "
+            "RETURNING *",
+            (claimed_by, int(time.time()))
+        ).fetchall()
+        conn.commit()
+    if not rows:
+        return None
+    job = _job_from_row(rows[0])
+    _cache_invalidate(job['id'])
+    return job
+
+def count_queued_jobs() -> int:
+    """Number of jobs waiting for a worker."""
+    with get_db() as conn:
+        return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+def heartbeat_jobs(claimed_by: str):
+    """Record that the process claimed_by is still working on the jobs it claimed."""
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE status = 'processing' AND claimed_by = ?",
+            (int(time.time()), claimed_by)
         )
-        return cursor.fetchall()
+        conn.commit()
+
+def requeue_interrupted_jobs(stale_after: float) -> int:
+    """Put processing jobs whose claimant stopped sending heartbeats back in the queue.
+
+    Only jobs without a heartbeat in the last stale_after seconds are touched, so jobs
+    another live process is rendering stay where they are. Returns how many were requeued.
+    """
+    with get_db() as conn:
+        interrupted = [
+            row['id'] for row in
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', message = '', claimed_by = NULL WHERE status = 'processing' "
+                "AND (heartbeat_at IS NULL OR heartbeat_at < ?) RETURNING id",
+                (int(time.time() - stale_after),)
+            )
+        ]
+        conn.commit()
+    _cache_invalidate(*interrupted)
+    return len(interrupted)
+
+def get_seconds_until_next_expiry(hours: int) -> Optional[float]:
+    """Seconds until the oldest completed job passes the cleanup age, or None if there are none."""
+    with get_db() as conn:
+        row = conn.execute(
+            "SELECT MIN(completed_at) AS oldest FROM jobs WHERE status = 'completed'"
+        ).fetchone()
+    if row['oldest'] is None:
+        return None
+    return row['oldest'] + hours * 3600 - time.time()
 
 def delete_all_jobs():
     with get_db() as conn:
+        # Take the write lock up front instead of upgrading a read lock mid-statement
+        conn.execute("BEGIN IMMEDIATE")
         conn.execute("DELETE FROM jobs")
         conn.commit()
+        _reclaim_free_pages(conn)
+    _cache_clear()
@@ -0,0 +1,43 @@
+"""HTTP response helpers shared by the user-facing app (main.py) and the admin app (admin_main.py)."""
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+class VideoFileResponse(FileResponse):
+    # Starlette reads files in a worker thread per chunk; larger chunks mean
+    # far fewer thread round-trips when streaming multi-hundred-MB renders.
+    chunk_size = 1024 * 1024
+
+# Job outputs never change once written, so browsers can keep what they've already
+# fetched (including video ranges while scrubbing) and revalidate cheaply afterwards
+FILE_CACHE_CONTROL = "private, max-age=3600"
+
+def file_cache_headers(stat_result: os.stat_result) -> dict:
+    return {
+        "ETag": f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{int(stat_result.st_mtime):x}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": FILE_CACHE_CONTROL,
+    }
+
+def not_modified(request: Request, headers: dict) -> Optional[Response]:
+    """Return a 304 response if the client's cached copy is still current."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        current = headers["ETag"] in (tag.strip() for tag in if_none_match.split(","))
+    else:
+        # Only consulted without If-None-Match, as RFC 9110 requires
+        current = unmodified_since(request.headers.get("if-modified-since"), headers.get("Last-Modified"))
+    if current:
+        return Response(status_code=304, headers=headers)
+    return None
+
+def unmodified_since(if_modified_since: Optional[str], last_modified: Optional[str]) -> bool:
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError):
+        # Unparseable, or a naive date that can't be compared with ours
+        return False
@@ -1,27 +1,83 @@
 import os
 import uuid
 import shutil
+import socket
 import asyncio
+import errno
+import hashlib
+import json
 import logging
-import subprocess
+import queue
 import sys
+import time
+import zipfile
+import multiprocessing
+import multiprocessing.forkserver
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import List, Dict
-from fastapi import FastAPI, UploadFile, File, BackgroundTasks, HTTPException, Response, Cookie, Depends, Form
+from fastapi import FastAPI, UploadFile, File, BackgroundTasks, HTTPException, Response, Cookie, Depends, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.datastructures import Headers
 from pydantic import BaseModel
 from pathlib import Path
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 import aiofiles
 from typing import Optional
 import httpx
 import database
+from config import CONFIG
+from storage import safe_unlink
+from http_cache import VideoFileResponse, file_cache_headers, not_modified
+
+# Records go through a queue to a listener thread that formats and writes them,
+# so worker coroutines never wait on a contended stdout. The listener is started
+# by the lifespan rather than here: this module is also imported in the render
+# forkserver, which must not have threads running when it forks.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = QueueListener(_log_queue, _log_handler)
 
 # Configuration
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
+# Render processes get absolute replay paths so they don't depend on the working directory
+UPLOAD_DIR_ABS = UPLOAD_DIR.absolute()
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+ZIP_CHUNK_SIZE = 1024 * 1024
+# httpx's 5 s default is too short for Discord to take in a large video
+DISCORD_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+# Shared by all webhook uploads so they reuse keep-alive connections to Discord
+# instead of paying for a new TCP and TLS handshake per job; opened by lifespan()
+_http_client: Optional[httpx.Client] = None
 RENDERER_ROOT = Path("../../minimap_renderer/src").resolve() # Pointing to the src directory where render.py lives
 
+# Renders run in processes forked from a forkserver that has already imported the
+# renderer, so each job skips interpreter startup and the renderer's imports while
+# still getting a fresh process of its own (isolated memory, a real exit code)
+sys.path.append(str(RENDERER_ROOT))
+import render_job
+
+if "forkserver" in multiprocessing.get_all_start_methods():
+    RENDER_CONTEXT = multiprocessing.get_context("forkserver")
+    RENDER_CONTEXT.set_forkserver_preload(["render_job"])
+else:
+    RENDER_CONTEXT = multiprocessing.get_context("spawn")
+
+# Each worker waits for its render process in a thread for as long as the render
+# takes. Those threads come from a pool of their own, sized to the workers by
+# lifespan(), so renders can't use up the default pool that the heartbeat, the
+# queue and the request handlers rely on
+_render_executor: Optional[ThreadPoolExecutor] = None
+
 # Ensure directories exist
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
@@ -40,10 +96,19 @@ class JobResponse(BaseModel):
     completed_at: Optional[str] = None
 
 # Worker Queue
-queue = asyncio.Queue()
+# The jobs table is the queue, shared by every process using the database.
+# Uploads in this process wake the workers directly; jobs queued by other
+# processes are picked up on the next poll.
+QUEUE_POLL_INTERVAL = 2.0
+_job_available = asyncio.Event()
+# Jobs are claimed in this process's name and kept alive with a heartbeat. A job
+# whose heartbeat stops (its process died) goes back in the queue, while jobs that
+# other live processes are rendering are left alone.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+HEARTBEAT_INTERVAL = 30.0
+HEARTBEAT_STALE_AFTER = 4 * HEARTBEAT_INTERVAL
 
 def construct_discord_payload(json_path: Path) -> dict:
-    import json
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
             players = json.load(f)
@@ -51,14 +116,6 @@ def construct_discord_payload(json_path: Path) -> dict:
         if not players:
             return {"content": "No player info available."}
 
-        # Group by relation
-        teams = {}
-        for player in players:
-            relation = player.get('relation', 2)
-            if relation not in teams:
-                teams[relation] = []
-            teams[relation].append(player)
-            
         # Identify "Player In Render"
         # The recording player typically has a relation that is not 0 (Ally) or 1 (Enemy).
         # It might be 2 (Neutral) or something else (e.g. -1, or a specific self-flag).
@@ -66,17 +123,17 @@ def construct_discord_payload(json_path: Path) -> dict:
         main_players = []
         other_players = []
         
-        for r, p_list in teams.items():
+        for player in players:
             # Convert relation to int just in case it's a string in JSON
             try:
-                r_int = int(r)
-            except:
-                r_int = -999 # Treat unknown non-ints as potential main player?
+                relation = int(player.get('relation', 2))
+            except (TypeError, ValueError):
+                relation = -999 # Treat unknown non-ints as potential main player?
                 
-            if r_int != 0 and r_int != 1:
-                main_players.extend(p_list)
+            if relation in (0, 1):
+                other_players.append(player)
             else:
-                other_players.extend(p_list)
+                main_players.append(player)
         
         # Sort other players by name for consistency
         other_players.sort(key=lambda x: x.get('name', ''))
@@ -121,111 +178,235 @@ def construct_discord_payload(json_path: Path) -> dict:
         return {"embeds": [embed]}
 
     except Exception as e:
-        print(f"Error formatting Discord message: {e}")
+        logger.error(f"Error formatting Discord message: {e}")
         return {"content": "Error formatting player info."}
 
+# Config keys that change the rendered video (the Discord webhook doesn't)
+RENDER_OPTIONS = ("anon", "no_chat", "no_logs", "team_tracers", "fps", "quality")
+
+def render_options(config: dict) -> dict:
+    """Keyword arguments for render.render_replay() from a job's config."""
+    return {
+        "anon": config.get("anon", False),
+        "no_chat": config.get("no_chat", False),
+        "no_logs": config.get("no_logs", False),
+        "team_tracers": config.get("team_tracers", False),
+        "fps": config.get("fps", 20),
+        "quality": config.get("quality", 7),
+        "use_tqdm": False,
+    }
+
+def render_in_subprocess(replay_path: str, options: dict, log_path: str) -> int:
+    """Render in a fresh process forked from the warm forkserver. Returns its exit code.
+
+    The process's output, including any traceback, is written to log_path.
+    """
+    process = RENDER_CONTEXT.Process(
+        target=render_job.run, args=(replay_path, options, log_path), daemon=True
+    )
+    process.start()
+    process.join(CONFIG.render_timeout)
+    if process.exitcode is None:
+        # A wedged render would otherwise hold this worker slot forever
+        process.kill()
+        process.join()
+        # Nothing else would clean up what it wrote next to the replay
+        base_path = os.path.splitext(replay_path)[0]
+        for partial in (f"{base_path}.mp4", f"{base_path}-builds.json"):
+            try:
+                os.unlink(partial)
+            except FileNotFoundError:
+                pass
+        raise TimeoutError(f"Render timed out after {CONFIG.render_timeout:g} seconds")
+    return process.exitcode
+
+def last_log_line(log_path: Path) -> str:
+    """The last non-empty line of a render log (usually the exception), or ''."""
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(max(f.seek(0, os.SEEK_END) - 4096, 0))
+            tail = f.read().decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+    lines = [line.strip() for line in tail.splitlines() if line.strip()]
+    return lines[-1] if lines else ""
+
+def make_render_key(replay_digest: bytes, config: dict) -> str:
+    """Identifies a render: the same replay bytes with the same options give the same video."""
+    options = json.dumps({name: config.get(name) for name in RENDER_OPTIONS}, sort_keys=True)
+    return hashlib.sha256(replay_digest + options.encode()).hexdigest()
+
+def reuse_render(render_key: str, video_path: Path, json_path: Path) -> bool:
+    """Hard-link an earlier job's outputs for the same render key. Returns False if there are none."""
+    cached = database.find_rendered_job(render_key)
+    if not cached:
+        return False
+    try:
+        os.link(cached["output_path"], video_path)
+    except OSError:
+        # Most likely deleted since the lookup; just render it again
+        return False
+    try:
+        os.link(OUTPUT_DIR / f"{cached['id']}.json", json_path)
+    except OSError:
+        pass
+    logger.info(f"Reusing render of job {cached['id']}")
+    return True
+
+async def notify_discord(config: dict, video_path: Path, json_path: Path):
+    webhook_url = config.get("discord_webhook_url")
+    if webhook_url:
+        try:
+            # The multipart body is read from a regular file, which would block
+            # the event loop (and every other job) for the whole upload
+            await asyncio.to_thread(send_discord_webhook, webhook_url, video_path, json_path)
+        except Exception as e:
+            logger.error(f"Discord upload error: {e}")
+
+def send_discord_webhook(webhook_url: str, video_path: Path, json_path: Path):
+    payload = {}
+    if json_path.exists():
+        payload = construct_discord_payload(json_path)
+
+    with open(video_path, "rb") as f:
+        # httpx streams file objects into the multipart body in small chunks
+        # rather than reading the whole video into memory first
+        files = {"file": (video_path.name, f, "video/mp4")}
+        # When sending files, JSON payload must be sent as 'payload_json' string
+        data = {"payload_json": json.dumps(payload)}
+        webhook_response = _http_client.post(webhook_url, data=data, files=files)
+        if webhook_response.status_code not in [200, 204]:
+            logger.error(f"Discord upload failed: {webhook_response.status_code} - {webhook_response.text}")
+
+def copy_across_devices(src: Path, dst: Path):
+    """Copy src to dst without passing the data through Python, then remove src."""
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            # copy_file_range() copies inside the kernel, or on the server for network filesystems
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except (AttributeError, OSError) as e:
+        if isinstance(e, OSError) and e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            raise
+        # Not supported between these filesystems (or not on Linux); shutil uses sendfile() instead
+        shutil.copyfile(src, dst)
+    os.unlink(src)
+
+async def move_file(src: Path, dst: Path):
+    """Rename src to dst, copying in a worker thread if they're on different filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        await asyncio.to_thread(copy_across_devices, src, dst)
+
+async def _next_job() -> dict:
+    """Claim the oldest queued job, waiting until there is one."""
+    while True:
+        _job_available.clear()
+        job = await asyncio.to_thread(database.claim_next_job, WORKER_ID)
+        if job:
+            return job
+        try:
+            await asyncio.wait_for(_job_available.wait(), QUEUE_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def finish_job(job_id: str, status: str, **kwargs) -> bool:
+    """Record a claimed job's outcome. Returns False if the job is no longer this process's.
+
+    That happens if the heartbeat lapsed and another process requeued and claimed it.
+    """
+    if await asyncio.to_thread(database.update_job_status, job_id, status, claimed_by=WORKER_ID, **kwargs):
+        return True
+    logger.warning(f"Job {job_id} was claimed by another worker; discarding this worker's result")
+    return False
+
 async def worker():
     while True:
-        job_id = await queue.get()
-        job = database.get_job(job_id)
-        
-        if not job:
-            queue.task_done()
-            continue
-            
+        job = await _next_job()
+        job_id = job['id']
+
         try:
-            database.update_job_status(job_id, JobStatus.PROCESSING)
-            
             # Reconstruct input path
             input_path = UPLOAD_DIR / f"{job_id}_{job['filename']}"
-            
-            # Construct command
-            # We need to run this from the root of the repo so imports work
-            cmd = [
-                sys.executable,
-                "-m",
-                "render",
-                "--replay",
-                str(input_path.absolute())
-            ]
-
+            final_output = OUTPUT_DIR / f"{job_id}.mp4"
+            final_json = OUTPUT_DIR / f"{job_id}.json"
+            render_log = OUTPUT_DIR / f"{job_id}.log"
             config = job['config']
-            if config.get("anon"):
-                cmd.append("--anon")
-            if config.get("no_chat"):
-                cmd.append("--no-chat")
-            if config.get("no_logs"):
-                cmd.append("--no-logs")
-            if config.get("team_tracers"):
-                cmd.append("--team-tracers")
-            
-            cmd.extend(["--fps", str(config.get("fps", 20))])
-            cmd.extend(["--quality", str(config.get("quality", 7))])
-            
-            print(f"Starting job {job_id}: {' '.join(cmd)}")
+
+            if job.get('render_key') and await asyncio.to_thread(reuse_render, job['render_key'], final_output, final_json):
+                if await finish_job(job_id, JobStatus.COMPLETED, output_path=str(final_output)):
+                    await notify_discord(config, final_output, final_json)
+                continue
             
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RENDERER_ROOT),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            options = render_options(config)
+            logger.info(f"Starting job {job_id}: {options}")
+
+            returncode = await asyncio.get_running_loop().run_in_executor(
+                _render_executor, render_in_subprocess,
+                str(UPLOAD_DIR_ABS / input_path.name), options, str(render_log.absolute())
             )
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
+            if returncode == 0:
                 # Move output file to output dir
                 # The renderer outputs .mp4 in the same dir as the replay
                 original_output = input_path.with_suffix(".mp4")
-                final_output = OUTPUT_DIR / f"{job_id}.mp4"
                 
                 if original_output.exists():
-                    shutil.move(str(original_output), str(final_output))
+                    await move_file(original_output, final_output)
                     
                     # Move JSON info file if it exists
                     original_json = input_path.with_suffix(".json")
                     # The renderer outputs {stem}-builds.json
                     original_json = input_path.parent / f"{input_path.stem}-builds.json"
-                    final_json = OUTPUT_DIR / f"{job_id}.json"
                     
                     if original_json.exists():
-                        shutil.move(str(original_json), str(final_json))
+                        await move_file(original_json, final_json)
                         
-                    database.update_job_status(job_id, JobStatus.COMPLETED, output_path=str(final_output))
-                    
-                    # Handle Discord Webhook
-                    webhook_url = config.get("discord_webhook_url")
-                    if webhook_url:
-                        try:
-                            payload = {}
-                            if final_json.exists():
-                                payload = construct_discord_payload(final_json)
-
-                            import json
-                            async with httpx.AsyncClient() as client:
-                                with open(final_output, "rb") as f:
-                                    files = {"file": (final_output.name, f, "video/mp4")}
-                                    # When sending files, JSON payload must be sent as 'payload_json' string
-                                    data = {"payload_json": json.dumps(payload)}
-                                    webhook_response = await client.post(webhook_url, data=data, files=files)
-                                    if webhook_response.status_code not in [200, 204]:
-                                        print(f"Discord upload failed: {webhook_response.status_code} - {webhook_response.text}")
-                        except Exception as e:
-                            print(f"Discord upload error: {e}")
+                    if await finish_job(job_id, JobStatus.COMPLETED, output_path=str(final_output)):
+                        await notify_discord(config, final_output, final_json)
 
                 else:
-                    database.update_job_status(job_id, JobStatus.FAILED, message="Output file not found after rendering.")
-                    print(f"Error: Output file not found: {original_output}")
+                    await finish_job(job_id, JobStatus.FAILED, message="Output file not found after rendering.")
+                    logger.error(f"Output file not found: {original_output}")
 
             else:
-                database.update_job_status(job_id, JobStatus.FAILED, message=f"Renderer failed with code {process.returncode}")
-                print(f"Renderer failed: {stderr.decode()}")
+                message = f"Renderer failed with code {returncode}"
+                reason = await asyncio.to_thread(last_log_line, render_log)
+                if reason:
+                    message += f": {reason}"
+                await finish_job(job_id, JobStatus.FAILED, message=message)
+                logger.error(f"Renderer failed for job {job_id} with code {returncode}, see {render_log}")
 
         except Exception as e:
-            database.update_job_status(job_id, JobStatus.FAILED, message=str(e))
-            print(f"Job failed with exception: {e}")
-        finally:
-            queue.task_done()
+            await finish_job(job_id, JobStatus.FAILED, message=str(e))
+            logger.error(f"Job {job_id} failed with exception: {e}")
+
+async def job_heartbeat():
+    """Keep this process's claimed jobs alive and requeue jobs whose process has died."""
+    while True:
+        try:
+            await asyncio.to_thread(database.heartbeat_jobs, WORKER_ID)
+            interrupted = await asyncio.to_thread(database.requeue_interrupted_jobs, HEARTBEAT_STALE_AFTER)
+            if interrupted:
+                logger.info(f"Re-queuing {interrupted} job(s) whose worker stopped responding")
+                _job_available.set()
+        except Exception as e:
+            logger.error(f"Job heartbeat failed: {e}")
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+def available_cpus() -> int:
+    # Unlike os.cpu_count(), this honours CPU sets such as docker --cpuset-cpus
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
 
 async def get_session_id(response: Response, session_id: Optional[str] = Cookie(None)):
     if not session_id:
@@ -233,17 +414,122 @@ async def get_session_id(response: Response, session_id: Optional[str] = Cookie(
         response.set_cookie(key="session_id", value=session_id, httponly=True)
     return session_id
 
+async def get_owned_job(job_id: str, session_id: str = Depends(get_session_id)) -> dict:
+    """The job named in the path, provided it belongs to the caller's session."""
+    job = database.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.get("session_id") != session_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return job
+
+async def get_completed_job(job: dict = Depends(get_owned_job)) -> dict:
+    if job["status"] != JobStatus.COMPLETED:
+        raise HTTPException(status_code=400, detail="Job not completed")
+
+    return job
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global _http_client, _render_executor
+    _log_listener.start()
     database.init_db()
-    max_workers = int(os.getenv("MAX_WORKERS", 1))
-    print(f"Starting {max_workers} worker(s)")
-    for _ in range(max_workers):
+    asyncio.create_task(job_heartbeat())
+    if RENDER_CONTEXT.get_start_method() == "forkserver":
+        # Start the forkserver, and its renderer import, now rather than on the first job
+        await asyncio.to_thread(multiprocessing.forkserver.ensure_running)
+    # Renders are CPU-bound: running more at once than there are CPUs only makes
+    # them all slower, so extra jobs wait in the queue instead
+    # The CPUs are shared by every server process on the machine, so each gets its share
+    cpus = max(available_cpus() // CONFIG.web_concurrency, 1)
+    workers = min(CONFIG.max_workers or cpus, cpus)
+    if CONFIG.max_workers and workers < CONFIG.max_workers:
+        logger.warning(
+            f"MAX_WORKERS={CONFIG.max_workers} exceeds this process's share of the CPUs "
+            f"(WEB_CONCURRENCY={CONFIG.web_concurrency}); capping at {workers}"
+        )
+    logger.info(f"Starting {workers} worker(s)")
+    # httpx.Client is thread-safe, and uploads run in worker threads
+    _http_client = httpx.Client(timeout=DISCORD_TIMEOUT)
+    _render_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+    for _ in range(workers):
         asyncio.create_task(worker())
-    yield
+    try:
+        yield
+    finally:
+        # Render processes are daemonic and die with this one, so don't wait for them
+        _render_executor.shutdown(wait=False, cancel_futures=True)
+        _http_client.close()
+        _log_listener.stop()
+
+class BodySizeLimitMiddleware:
+    """Answer 413 for request bodies over max_bytes, before they are spooled to disk.
+
+    FastAPI parses the whole multipart body before the upload handler runs,
+    so the limit has to be enforced on the ASGI receive channel.
+    """
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": "Upload too large"}, status_code=413)
+            return await response(scope, receive, send)
+
+        # Chunked bodies don't announce a length, so count what actually arrives
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+class QueueFullMiddleware:
+    """Answer 503 to uploads while queue_max jobs are waiting, before reading their body.
+
+    Turning uploads away while the backlog is this deep keeps replays from piling up
+    on disk faster than the workers can render them. It has to happen here because
+    FastAPI spools the whole body to disk before the upload handler runs.
+    """
+    def __init__(self, app, queue_max: int):
+        self.app = app
+        self.queue_max = queue_max
+
+    async def __call__(self, scope, receive, send):
+        if (
+            self.queue_max
+            and scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"] == "/api/upload"
+            and await asyncio.to_thread(database.count_queued_jobs) >= self.queue_max
+        ):
+            response = JSONResponse(
+                {"detail": "The render queue is full, please try again later"},
+                status_code=503,
+                headers={"Retry-After": "60"},
+            )
+            return await response(scope, receive, send)
+
+        await self.app(scope, receive, send)
 
 app = FastAPI(lifespan=lifespan)
 
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=CONFIG.max_upload_mb * 1024 * 1024)
+app.add_middleware(QueueFullMiddleware, queue_max=CONFIG.queue_max)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -269,9 +555,18 @@ async def upload_file(
     job_id = str(uuid.uuid4())
     file_path = UPLOAD_DIR / f"{job_id}_{file.filename}"
     
-    async with aiofiles.open(file_path, 'wb') as out_file:
-        content = await file.read()
-        await out_file.write(content)
+    # Copy in fixed-size chunks so memory use doesn't grow with the replay size,
+    # hashing on the way so repeat uploads can reuse an earlier render
+    replay_hash = hashlib.sha256()
+    try:
+        async with aiofiles.open(file_path, 'wb') as out_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                replay_hash.update(chunk)
+                await out_file.write(chunk)
+    except BaseException:
+        # No job row exists yet, so nothing else would ever delete the partial file
+        file_path.unlink(missing_ok=True)
+        raise
     
     config = {
         "anon": anon,
@@ -283,9 +578,10 @@ async def upload_file(
         "discord_webhook_url": discord_webhook_url
     }
     
-    database.create_job(job_id, file.filename, session_id, config)
+    render_key = make_render_key(replay_hash.digest(), config)
+    database.create_job(job_id, file.filename, session_id, config, render_key=render_key)
     
-    await queue.put(job_id)
+    _job_available.set()
     
     return {
         "id": job_id,
@@ -294,88 +590,81 @@ async def upload_file(
         "message": "Queued for rendering"
     }
 
-@app.get("/api/config/webhooks")
-async def get_discord_webhooks():
-    import json
-    webhooks_env = os.getenv("DISCORD_WEBHOOKS", "[]")
+def _load_discord_webhooks() -> bytes:
     try:
-        webhooks = json.loads(webhooks_env)
-        return webhooks
+        webhooks = json.loads(os.getenv("DISCORD_WEBHOOKS") or "[]")
     except json.JSONDecodeError:
-        print("Error decoding DISCORD_WEBHOOKS environment variable")
-        return []
-
-@app.get("/api/jobs", response_model=List[JobResponse])
-async def get_jobs(session_id: str = Depends(get_session_id)):
-    user_jobs = database.get_jobs_by_session(session_id)
-    return [
-        {
-            "id": job["id"],
-            "filename": job["filename"],
-            "status": job["status"],
-            "message": job.get("message", ""),
-            "completed_at": str(job["completed_at"]) if job.get("completed_at") else None
-        }
-        for job in user_jobs
-    ]
+        logger.error("Error decoding DISCORD_WEBHOOKS environment variable")
+        webhooks = []
+    return json.dumps(webhooks).encode("utf-8")
 
-@app.get("/api/stream/{job_id}")
-async def stream_video(job_id: str, session_id: str = Depends(get_session_id)):
-    job = database.get_job(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job["status"] != JobStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Job not completed")
+# The environment doesn't change while the process runs, so the list is parsed and encoded once
+DISCORD_WEBHOOKS_JSON = _load_discord_webhooks()
+DISCORD_WEBHOOKS_HEADERS = {
+    "ETag": f'"{hashlib.blake2b(DISCORD_WEBHOOKS_JSON, digest_size=16).hexdigest()}"',
+    "Cache-Control": "no-cache",
+}
 
-    if job.get("session_id") != session_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-        
-    output_path = Path(job.get("output_path")) if job.get("output_path") else None
-    if not output_path or not output_path.exists():
-         raise HTTPException(status_code=500, detail="Output file missing")
+@app.get("/api/config/webhooks")
+async def get_discord_webhooks(request: Request):
+    return not_modified(request, DISCORD_WEBHOOKS_HEADERS) or Response(
+        content=DISCORD_WEBHOOKS_JSON, media_type="application/json", headers=DISCORD_WEBHOOKS_HEADERS
+    )
 
-    return FileResponse(
+@app.get("/api/jobs", response_model=List[JobResponse])
+async def get_jobs(session_id: str = Depends(get_session_id)):
+    # Polled by every open page, so read only what the list shows (and skip decoding config)
+    return database.get_session_jobs_summary(session_id)
+
+def _attachment_disposition(filename: str) -> str:
+    # Same encoding FileResponse uses for its own Content-Disposition header
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def _video_response(request: Request, job: dict, filename: Optional[str] = None) -> Response:
+    """Serve a job's video. FileResponse answers Range requests with 206/416 itself."""
+    output_path = job.get("output_path")
+    # Stat once and hand the result to FileResponse so it doesn't stat again
+    try:
+        stat_result = os.stat(output_path) if output_path else None
+    except FileNotFoundError:
+        stat_result = None
+    if stat_result is None:
+        raise HTTPException(status_code=500, detail="Output file missing")
+
+    headers = file_cache_headers(stat_result)
+    unchanged = not_modified(request, headers)
+    if unchanged:
+        return unchanged
+
+    if CONFIG.video_accel_redirect:
+        # Let the fronting nginx send the file with sendfile() and handle Range itself
+        headers["X-Accel-Redirect"] = CONFIG.video_accel_redirect + quote(os.path.basename(output_path))
+        if filename:
+            headers["Content-Disposition"] = _attachment_disposition(filename)
+        return Response(media_type="video/mp4", headers=headers)
+
+    return VideoFileResponse(
         path=output_path,
+        filename=filename,
         media_type="video/mp4",
-        content_disposition_type="inline"
+        stat_result=stat_result,
+        headers=headers
     )
 
-@app.get("/api/download/{job_id}")
-async def download_video(job_id: str, session_id: str = Depends(get_session_id)):
-    job = database.get_job(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job["status"] != JobStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Job not completed")
-
-    if job.get("session_id") != session_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-        
-    output_path = Path(job.get("output_path")) if job.get("output_path") else None
-    if not output_path or not output_path.exists():
-         raise HTTPException(status_code=500, detail="Output file missing")
+@app.get("/api/stream/{job_id}")
+async def stream_video(request: Request, job: dict = Depends(get_completed_job)):
+    return _video_response(request, job)
 
-    return FileResponse(
-        path=output_path,
-        filename=f"{Path(job['filename']).stem}.mp4",
-        media_type="video/mp4"
-    )
+@app.get("/api/download/{job_id}")
+async def download_video(request: Request, job: dict = Depends(get_completed_job)):
+    return _video_response(request, job, filename=f"{Path(job['filename']).stem}.mp4")
 
 @app.get("/api/jobs/{job_id}/info")
-async def get_job_info(job_id: str, session_id: str = Depends(get_session_id)):
-    job = database.get_job(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job["status"] != JobStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Job not completed")
-
-    if job.get("session_id") != session_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-        
-    info_path = OUTPUT_DIR / f"{job_id}.json"
+async def get_job_info(job: dict = Depends(get_completed_job)):
+    info_path = OUTPUT_DIR / f"{job['id']}.json"
     if not info_path.exists():
          raise HTTPException(status_code=404, detail="Player info not found")
 
@@ -384,75 +673,137 @@ async def get_job_info(job_id: str, session_id: str = Depends(get_session_id)):
         media_type="application/json"
     )
 
+class _ZipSink:
+    """Write-only file object that collects what ZipFile writes until drained."""
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _stat_zip_members(jobs: List[dict]) -> List[tuple]:
+    """(arcname, path, size, mtime) for each job video that exists.
+
+    The files themselves are only opened by _iter_zip, one at a time, so nothing
+    is left open if the response never starts.
+    """
+    members = []
+    for job in jobs:
+        output_path = job.get("output_path")
+        if not output_path:
+            continue
+        try:
+            st = os.stat(output_path)
+        except FileNotFoundError:
+            continue
+        members.append((f"{Path(job['filename']).stem}.mp4", output_path, st.st_size, st.st_mtime))
+    return members
+
+def _zip_length(members: List[tuple]) -> Optional[int]:
+    """Exact size of the stored archive _iter_zip writes, or None if it needs ZIP64."""
+    if len(members) >= 0xFFFF:
+        return None
+    length = 22  # end of central directory record
+    for arcname, _, size, _ in members:
+        if size * 1.05 > zipfile.ZIP64_LIMIT:
+            return None
+        name_len = len(arcname.encode("utf-8"))
+        # local header + data + data descriptor, then the central directory entry
+        length += 30 + name_len + size + 16 + 46 + name_len
+    return length if length <= zipfile.ZIP64_LIMIT else None
+
+def _iter_zip(members: List[tuple]):
+    """Yield a ZIP_STORED archive of the members as it is written.
+
+    mp4 data doesn't compress, so entries are stored as-is and the archive
+    is never held in memory as a whole.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as zip_file:
+        for arcname, path, size, mtime in members:
+            zinfo = zipfile.ZipInfo(arcname, time.localtime(mtime)[:6])
+            zinfo.file_size = size
+            with open(path, "rb") as f, zip_file.open(zinfo, "w") as dest:
+                # Exactly the size that went into Content-Length; renders never change
+                # once written, so a short read means the file was deleted meanwhile
+                remaining = size
+                while remaining:
+                    chunk = f.read(min(ZIP_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise OSError(f"{path} shrank while it was being zipped")
+                    remaining -= len(chunk)
+                    dest.write(chunk)
+                    yield sink.drain()
+    yield sink.drain()
+
+# Archives are built on their own small pool so a few large downloads can't
+# tie up the threadpool that file responses and sync handlers share
+zip_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="zip")
+
+async def _stream_zip(members: List[tuple]):
+    """Run _iter_zip on zip_executor, passing its chunks on to the response."""
+    chunks = _iter_zip(members)
+    step = None
+    try:
+        while True:
+            step = zip_executor.submit(next, chunks, None)
+            chunk = await asyncio.wrap_future(step)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        # Close the generator, and with it the member file it has open, once it is
+        # no longer running: a step may still be in progress if the client went away
+        if step is None:
+            chunks.close()
+        else:
+            step.add_done_callback(lambda _: chunks.close())
+
 @app.get("/api/download-all")
 async def download_all_videos(session_id: str = Depends(get_session_id)):
-    jobs = database.get_jobs_by_session(session_id)
-    completed_jobs = [
-        job for job in jobs
-        if job["status"] == JobStatus.COMPLETED
-    ]
+    completed_jobs = database.get_session_outputs(session_id)
     
     if not completed_jobs:
         raise HTTPException(status_code=404, detail="No completed jobs found")
         
-    # Create a zip file in memory
-    import zipfile
-    import io
-    from datetime import datetime
-    
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for job in completed_jobs:
-            output_path = Path(job.get("output_path")) if job.get("output_path") else None
-            if output_path and output_path.exists():
-                zip_file.write(output_path, arcname=f"{Path(job['filename']).stem}.mp4")
-    
-    zip_buffer.seek(0)
+    members = await asyncio.to_thread(_stat_zip_members, completed_jobs)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"minimap_renders_{timestamp}.zip"
-    
-    from fastapi.responses import StreamingResponse
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    length = _zip_length(members)
+    if length is not None:
+        headers["Content-Length"] = str(length)
     
     return StreamingResponse(
-        zip_buffer,
+        _stream_zip(members),
         media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers=headers
     )
 
 @app.delete("/api/jobs/{job_id}")
-async def delete_job(job_id: str, session_id: str = Depends(get_session_id)):
-    job = database.get_job(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.get("session_id") != session_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-
-    # Delete files
-    # 1. Upload file
-    upload_path = UPLOAD_DIR / f"{job_id}_{job['filename']}"
-    if upload_path.exists():
-        try:
-            os.remove(upload_path)
-        except OSError as e:
-            print(f"Error deleting upload file {upload_path}: {e}")
-
-    # 2. Output file
-    output_path = Path(job.get("output_path")) if job.get("output_path") else None
-    if output_path and output_path.exists():
-        try:
-            os.remove(output_path)
-        except OSError as e:
-            print(f"Error deleting output file {output_path}: {e}")
-            
-    # 3. JSON info file
-    json_path = OUTPUT_DIR / f"{job_id}.json"
-    if json_path.exists():
-        try:
-            os.remove(json_path)
-        except OSError as e:
-            print(f"Error deleting json file {json_path}: {e}")
+async def delete_job(job: dict = Depends(get_owned_job)):
+    job_id = job["id"]
+
+    # Delete the upload, the rendered video, the JSON info file and the render log off
+    # the event loop, all at once, since each unlink can be slow on a network filesystem
+    paths = [
+        UPLOAD_DIR / f"{job_id}_{job['filename']}",
+        OUTPUT_DIR / f"{job_id}.json",
+        OUTPUT_DIR / f"{job_id}.log",
+    ]
+    if job.get("output_path"):
+        paths.append(Path(job["output_path"]))
+    await asyncio.gather(*(asyncio.to_thread(safe_unlink, path) for path in paths))
 
     # Delete from DB
     database.delete_job(job_id)
@@ -461,9 +812,19 @@ async def delete_job(job_id: str, session_id: str = Depends(get_session_id)):
 
 @app.get("/api/config/cleanup")
 async def get_cleanup_config():
-    cleanup_hours = int(os.getenv("CLEANUP_HOURS", 24))
-    return {"hours": cleanup_hours}
+    return {"hours": CONFIG.cleanup_hours}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers claim jobs through the shared database, so several server processes can
+    # run side by side; uvicorn needs an import string rather than the app to fork them
+    workers = CONFIG.web_concurrency
+    uvicorn.run(
+        app if workers == 1 else "main:app",
+        host="0.0.0.0",
+        port=8000,
+        # uvloop has no Windows build; "auto" falls back to asyncio's own loop there
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=workers,
+    )
@@ -0,0 +1,18 @@
+"""Entry point for render processes started by main.py's workers.
+
+Imported by the forkserver ahead of time (and with it the renderer), so each
+job's process starts with everything already loaded.
+"""
+import os
+
+import render
+
+
+def run(replay_path: str, options: dict, log_path: str):
+    """Render a replay with this process's stdout and stderr going to log_path."""
+    with open(log_path, "wb") as log:
+        # Redirect the file descriptors rather than sys.stdout/sys.stderr so output
+        # from ffmpeg and tracebacks printed at exit end up in the log too
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+    render.render_replay(replay_path, **options)
@@ -0,0 +1,15 @@
+"""File helpers shared by the user-facing app (main.py) and the admin app (admin_main.py)."""
+import logging
+import os
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+def safe_unlink(path: Union[str, os.PathLike]):
+    # A single unlink instead of checking exists() first; a missing file is already gone
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Error deleting file {path}: {e}")
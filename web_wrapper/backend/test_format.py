@@ -11,20 +11,14 @@ def construct_discord_payload(json_path: Path) -> dict:
         if not players:
             return {"content": "No player info available."}
 
-        # Group by relation
-        teams = {}
-        for player in players:
-            relation = player.get('relation', 2)
-            if relation not in teams:
-                teams[relation] = []
-            teams[relation].append(player)
-            
         # Identify "Player In Render" (Neutral / Relation 2)
-        main_players = teams.get(2, [])
+        main_players = []
         other_players = []
-        for r, p_list in teams.items():
-            if r != 2:
-                other_players.extend(p_list)
+        for player in players:
+            if player.get('relation', 2) == 2:
+                main_players.append(player)
+            else:
+                other_players.append(player)
         
         # Sort other players by name
         other_players.sort(key=lambda x: x.get('name', ''))
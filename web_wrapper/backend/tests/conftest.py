@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# main.py resolves the renderer and its storage directories relative to the working
+# directory, and database.py reads DB_PATH at import, so both are set up first
+os.chdir(BACKEND_DIR)
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "jobs.db")
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, initialised database in tmp_path for each test."""
+    conn = getattr(database._local, "conn", None)
+    if conn is not None:
+        conn.close()
+        database._local.conn = None
+    if database._watch_conn is not None:
+        database._watch_conn.close()
+        monkeypatch.setattr(database, "_watch_conn", None)
+    database._cache_clear()
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "jobs.db")
+    database.init_db()
+    yield database.DB_PATH
+    conn = getattr(database._local, "conn", None)
+    if conn is not None:
+        conn.close()
+        database._local.conn = None
+    database._cache_clear()
+
+
+@pytest.fixture
+def set_column(db):
+    """Set a job's column through a separate connection, the way another process would."""
+    def set_column(job_id, column, value):
+        with sqlite3.connect(db) as conn:
+            conn.execute(f"UPDATE jobs SET {column} = ? WHERE id = ?", (value, job_id))
+    return set_column
@@ -0,0 +1,22 @@
+import time
+
+import database
+
+
+def test_reap_old_completed_jobs_deletes_only_expired_completed_jobs(db, set_column):
+    for job_id in ("expired", "recent", "failed", "queued"):
+        database.create_job(job_id, f"{job_id}.wowsreplay", "s", {})
+    database.update_job_status("expired", "completed", output_path="outputs/expired.mp4")
+    database.update_job_status("recent", "completed")
+    database.update_job_status("failed", "failed")
+    set_column("expired", "completed_at", int(time.time()) - 25 * 3600)
+    set_column("failed", "created_at", int(time.time()) - 25 * 3600)
+    set_column("queued", "created_at", int(time.time()) - 25 * 3600)
+
+    reaped = database.reap_old_completed_jobs(24)
+
+    assert [dict(job) for job in reaped] == [
+        {"id": "expired", "filename": "expired.wowsreplay", "output_path": "outputs/expired.mp4"}
+    ]
+    assert sorted(job["id"] for job in database.get_all_jobs_summary()) == ["failed", "queued", "recent"]
+    assert database.reap_old_completed_jobs(24) == []
@@ -0,0 +1,29 @@
+import io
+import os
+import zipfile
+
+from fastapi.testclient import TestClient
+
+import database
+import main
+
+
+def test_download_all_streams_a_stored_zip_of_the_announced_length(db, tmp_path):
+    names = ["plain", "ünïcødé", "日本語 replay"]
+    for i, name in enumerate(names):
+        video = tmp_path / f"{i}.mp4"
+        video.write_bytes(os.urandom(100_000 + i))
+        database.create_job(f"job{i}", f"{name}.wowsreplay", "session", {})
+        database.update_job_status(f"job{i}", "completed", output_path=str(video))
+    database.create_job("other", "other.wowsreplay", "someone-else", {})
+    database.update_job_status("other", "completed", output_path=str(tmp_path / "0.mp4"))
+
+    client = TestClient(main.app, cookies={"session_id": "session"})
+    response = client.get("/api/download-all")
+
+    assert response.status_code == 200
+    assert int(response.headers["content-length"]) == len(response.content)
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert sorted(archive.namelist()) == sorted(f"{name}.mp4" for name in names)
+    assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+    assert archive.read("plain.mp4") == (tmp_path / "0.mp4").read_bytes()
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+import database
+import main
+
+
+def test_video_responses_revalidate_with_etag_and_last_modified(db, tmp_path):
+    video = tmp_path / "job.mp4"
+    video.write_bytes(b"video")
+    database.create_job("job", "a.wowsreplay", "session", {})
+    database.update_job_status("job", "completed", output_path=str(video))
+    client = TestClient(main.app, cookies={"session_id": "session"})
+
+    response = client.get("/api/stream/job")
+    assert response.status_code == 200 and response.content == b"video"
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    assert client.get("/api/stream/job", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/stream/job", headers={"If-Modified-Since": last_modified}).status_code == 304
+    # If-None-Match wins over If-Modified-Since when both are sent
+    response = client.get("/api/stream/job", headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified})
+    assert response.status_code == 200
@@ -0,0 +1,19 @@
+import database
+
+
+def test_get_job_sees_status_changes_made_by_other_processes(db, set_column):
+    database.create_job("job", "a.wowsreplay", "s", {})
+    assert database.get_job("job")["status"] == "queued"
+    set_column("job", "status", "completed")
+    assert database.get_job("job")["status"] == "completed"
+
+
+def test_changes_to_a_returned_job_do_not_reach_the_cache(db):
+    database.create_job("job", "a.wowsreplay", "s", {"fps": 20})
+    database.update_job_status("job", "completed")
+
+    for _ in range(2):
+        job = database.get_job("job")
+        assert job["status"] == "completed" and job["config"] == {"fps": 20}
+        job["status"] = "changed"
+        job["config"]["fps"] = 60
@@ -0,0 +1,33 @@
+import sqlite3
+from datetime import datetime
+
+import database
+
+
+def test_init_db_converts_text_timestamps_to_epoch_seconds(tmp_path, monkeypatch, db):
+    old_db = tmp_path / "old.db"
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("""
+            CREATE TABLE jobs (
+                id TEXT PRIMARY KEY, filename TEXT NOT NULL, status TEXT NOT NULL, message TEXT,
+                session_id TEXT, created_at TIMESTAMP, completed_at TIMESTAMP, config TEXT, output_path TEXT
+            )
+        """)
+        conn.execute(
+            "INSERT INTO jobs VALUES ('old', 'a.wowsreplay', 'completed', '', 's', "
+            "'2024-03-01 12:00:00.123456', '2024-03-01 12:30:00', '{}', NULL)"
+        )
+    database._local.conn.close()
+    database._local.conn = None
+    monkeypatch.setattr(database, "DB_PATH", old_db)
+
+    database.init_db()
+
+    with sqlite3.connect(old_db) as conn:
+        created_at, completed_at, column_type = conn.execute(
+            "SELECT created_at, completed_at, typeof(created_at) FROM jobs"
+        ).fetchone()
+    # The text was local time, as written by datetime.now()
+    assert column_type == "integer"
+    assert created_at == int(datetime(2024, 3, 1, 12, 0, 0).timestamp())
+    assert completed_at == int(datetime(2024, 3, 1, 12, 30, 0).timestamp())
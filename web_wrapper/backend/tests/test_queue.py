@@ -0,0 +1,46 @@
+import time
+
+import database
+
+
+def _status(job_id):
+    return database.get_job(job_id)["status"]
+
+
+def test_claim_next_job_hands_out_the_oldest_job_once(db):
+    database.create_job("first", "a.wowsreplay", "s", {})
+    database.create_job("second", "b.wowsreplay", "s", {})
+
+    job = database.claim_next_job("worker-a")
+    assert job["id"] == "first" and job["status"] == "processing"
+    assert job["claimed_by"] == "worker-a" and job["heartbeat_at"]
+    assert database.claim_next_job("worker-b")["id"] == "second"
+    assert database.claim_next_job("worker-a") is None
+
+
+def test_requeue_only_touches_jobs_without_a_recent_heartbeat(db, set_column):
+    database.create_job("dead", "a.wowsreplay", "s", {})
+    database.create_job("alive", "b.wowsreplay", "s", {})
+    database.claim_next_job("dead-worker")
+    database.claim_next_job("live-worker")
+    set_column("dead", "heartbeat_at", int(time.time()) - 600)
+    set_column("alive", "heartbeat_at", int(time.time()) - 600)
+    database.heartbeat_jobs("live-worker")
+
+    assert database.requeue_interrupted_jobs(120) == 1
+    assert _status("dead") == "queued"
+    assert _status("alive") == "processing"
+    assert database.claim_next_job("live-worker")["id"] == "dead"
+
+
+def test_a_requeued_jobs_old_worker_cannot_overwrite_its_status(db, set_column):
+    database.create_job("job", "a.wowsreplay", "s", {})
+    database.claim_next_job("stalled-worker")
+    set_column("job", "heartbeat_at", int(time.time()) - 600)
+    database.requeue_interrupted_jobs(120)
+    database.claim_next_job("new-worker")
+
+    assert not database.update_job_status("job", "failed", message="late", claimed_by="stalled-worker")
+    assert _status("job") == "processing"
+    assert database.update_job_status("job", "completed", output_path="out.mp4", claimed_by="new-worker")
+    assert _status("job") == "completed"
@@ -0,0 +1,24 @@
+import os
+
+import database
+import main
+
+
+def test_reuse_render_hard_links_an_earlier_jobs_outputs(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "OUTPUT_DIR", tmp_path)
+    video = tmp_path / "old.mp4"
+    video.write_bytes(b"video")
+    (tmp_path / "old.json").write_text("[]")
+    key = main.make_render_key(b"replay", {"fps": 20})
+    database.create_job("old", "a.wowsreplay", "s", {"fps": 20}, render_key=key)
+
+    # Not completed yet, so there is nothing to reuse
+    assert not main.reuse_render(key, tmp_path / "new.mp4", tmp_path / "new.json")
+
+    database.update_job_status("old", "completed", output_path=str(video))
+    assert main.reuse_render(key, tmp_path / "new.mp4", tmp_path / "new.json")
+    assert os.path.samefile(tmp_path / "new.mp4", video)
+    assert os.path.samefile(tmp_path / "new.json", tmp_path / "old.json")
+
+    other_key = main.make_render_key(b"replay", {"fps": 30})
+    assert not main.reuse_render(other_key, tmp_path / "x.mp4", tmp_path / "x.json")
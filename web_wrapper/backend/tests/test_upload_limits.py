@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import database
+import main
+
+
+def _echo_app(middleware, **options):
+    app = FastAPI()
+
+    @app.post("/api/upload")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    app.add_middleware(middleware, **options)
+    return TestClient(app)
+
+
+def test_body_size_limit_rejects_large_content_length():
+    client = _echo_app(main.BodySizeLimitMiddleware, max_bytes=10)
+    assert client.post("/api/upload", content=b"x" * 10).json() == {"size": 10}
+    response = client.post("/api/upload", content=b"x" * 11)
+    assert response.status_code == 413
+
+
+def test_body_size_limit_rejects_large_chunked_bodies():
+    client = _echo_app(main.BodySizeLimitMiddleware, max_bytes=10)
+
+    def chunks():
+        for _ in range(4):
+            yield b"xxxx"
+
+    response = client.post("/api/upload", content=chunks())
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+
+
+def test_full_queue_rejects_uploads_before_reading_the_body(db):
+    client = _echo_app(main.QueueFullMiddleware, queue_max=1)
+    assert client.post("/api/upload", content=b"x").status_code == 200
+
+    database.create_job("waiting", "a.wowsreplay", "s", {})
+
+    def body():
+        pytest.fail("the body was read")
+        yield b""
+
+    response = client.post("/api/upload", content=body())
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "60"
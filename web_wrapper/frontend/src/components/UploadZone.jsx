@@ -68,7 +68,7 @@ const UploadZone = ({ onUploadComplete, settings }) => {
             onUploadComplete();
         } catch (err) {
             console.error("Upload failed", err);
-            setError("Failed to upload one or more files.");
+            setError(err.response?.data?.detail || "Failed to upload one or more files.");
         } finally {
             setUploading(false);
         }
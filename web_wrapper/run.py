@@ -1,6 +1,7 @@
 import subprocess
 import sys
 import os
+import signal
 import time
 from pathlib import Path
 
@@ -16,25 +17,37 @@ def get_local_ip():
     except:
         return 'localhost'
 
+def start_service(args, cwd):
+    # Run each service in its own process group so stopping it also stops
+    # anything it spawned (npm starts vite as a child, for example)
+    if os.name == "nt":
+        return subprocess.Popen(args, cwd=str(cwd), creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(args, cwd=str(cwd), start_new_session=True)
+
+def stop_service(process):
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            # The whole group exited after the poll() above
+            pass
+
 def main():
     base_dir = Path(__file__).parent.absolute()
     backend_dir = base_dir / "backend"
     frontend_dir = base_dir / "frontend"
 
     print("Starting Backend...")
-    backend_process = subprocess.Popen(
-        [sys.executable, "main.py"],
-        cwd=str(backend_dir),
-        shell=True
-    )
+    backend_process = start_service([sys.executable, "main.py"], backend_dir)
 
     print("Starting Frontend...")
     # Using npm run dev
-    frontend_process = subprocess.Popen(
-        ["npm", "run", "dev"],
-        cwd=str(frontend_dir),
-        shell=True
-    )
+    npm = "npm.cmd" if os.name == "nt" else "npm"
+    frontend_process = start_service([npm, "run", "dev"], frontend_dir)
 
     local_ip = get_local_ip()
     print("\nServices are running!")
@@ -47,8 +60,8 @@ def main():
             time.sleep(1)
     except KeyboardInterrupt:
         print("\nStopping services...")
-        backend_process.terminate()
-        frontend_process.terminate()
+        stop_service(backend_process)
+        stop_service(frontend_process)
         sys.exit(0)
 
 if __name__ == "__main__":